@@ -15,26 +15,60 @@ Version: 2.1.1
 """
 
 import os
-import subprocess
+import sys
+import stat
+import time
+import asyncio
 import logging
+import logging.handlers
+import queue
 import platform
 import shutil
 import re
-from fastapi import FastAPI, HTTPException
+import threading
+import itertools
+import concurrent.futures
+import aiofiles
+import orjson
+from collections import OrderedDict
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List, Tuple
 from pathlib import Path
 
+# watchdog is optional: without it the caches are still kept current by
+# the explicit refreshes in the write endpoints and the mtime-based
+# sync in the list endpoints.
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
 # ---------------------------------------------------------
 # Logging Setup
 # ---------------------------------------------------------
+# Handlers hang off a QueueListener so request paths only enqueue log
+# records; the blocking disk/console writes happen on the listener's
+# background thread instead of the event loop.
+_log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+_log_file_handler = logging.FileHandler("server.log", delay=True)
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_LOG_LISTENER = logging.handlers.QueueListener(
+    _log_queue, _log_file_handler, _log_stream_handler, respect_handler_level=True
+)
+_LOG_LISTENER.start()
+
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("server.log"),
-        logging.StreamHandler()
-    ]
+    format="%(message)s",  # records are formatted by the listener's handlers
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -44,7 +78,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Arduino Project Manager",
     description="API for managing Arduino projects, libraries, and board cores with arduino-cli (cached file listing).",
-    version="2.1.1"
+    version="2.1.1",
+    default_response_class=ORJSONResponse
 )
 
 # ---------------------------------------------------------
@@ -72,6 +107,11 @@ PROJECT_CACHE: Dict[str, Dict[str, any]] = {}
 # LIBRARY_CACHE: Map of library_name -> {path: Path, files: [relPaths]}
 LIBRARY_CACHE: Dict[str, Dict[str, any]] = {}
 
+# Dedicated executor for disk walks/copies, kept separate from FastAPI's
+# default threadpool so a burst of filesystem work can't starve other
+# offloaded handlers.
+FS_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="fs")
+
 SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9_. -]+$")
 
 
@@ -114,9 +154,21 @@ def project_file_for(project_name: str, file_path: str) -> Path:
 
 def library_file_for(library_name: str, file_path: str) -> Path:
     library = safe_name(library_name, "library name")
-    if library not in LIBRARY_CACHE:
+    cache = LIBRARY_CACHE
+    if library not in cache:
         raise HTTPException(status_code=404, detail="Library not found")
-    return resolve_under(LIBRARY_CACHE[library]["path"], safe_relative_path(file_path, "file path"), "file path")
+    return resolve_under(cache[library]["path"], safe_relative_path(file_path, "file path"), "file path")
+
+
+def is_existing_dir(path: Path) -> bool:
+    """
+    True if path exists and is a directory, using a single stat call
+    instead of the two syscalls of .exists() + .is_dir().
+    """
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        return False
 
 
 def safe_cli_arg(value: str, label: str) -> str:
@@ -125,47 +177,170 @@ def safe_cli_arg(value: str, label: str) -> str:
         raise HTTPException(status_code=400, detail=f"Invalid {label}")
     return text
 
-def get_files_in_dir(base_dir: Path) -> List[str]:
+# File/dir names skipped by every directory walk (macOS/Windows droppings).
+_SKIP_NAMES = frozenset({'.DS_Store', 'Thumbs.db'})
+
+# Top-level folders under ARDUINO_DIR that are never projects.
+_EXCLUDED_DIRS = frozenset({"hardware", "libraries", "tools"})
+
+# Monotonic counter stamped onto cache entries; a rebuilt entry gets a
+# new value, which is what the listing ETags are derived from.
+_CACHE_ENTRY_VERSION = itertools.count(1)
+
+
+def iter_files_in_dir(base_dir: Path) -> Iterator[str]:
     """
-    Return a sorted list of all relative file paths in base_dir, skipping hidden/system files.
+    Yield the relative path of every file in base_dir (unordered),
+    skipping hidden/system files. Peak memory is one path at a time,
+    which suits streaming consumers.
+
+    Uses an iterative os.scandir() traversal instead of os.walk so that the
+    dir/file classification comes straight from the directory read, avoiding
+    an extra stat() per entry on large library trees.
     """
-    file_paths = []
-    for root, dirs, files in os.walk(base_dir):
-        # Filter out hidden subdirectories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        for f in files:
-            if f.startswith('.') or f in ['.DS_Store', 'Thumbs.db']:
-                continue
-            full_path = Path(root) / f
-            rel_path = full_path.relative_to(base_dir)
-            file_paths.append(str(rel_path))
-    return sorted(file_paths)
+    skip = _SKIP_NAMES
+    sep = os.sep
+    # Each stack item carries the relative prefix for its directory so the
+    # inner loop builds relative paths by plain string concatenation instead
+    # of a per-file os.path.join/relpath call.
+    stack = [(str(base_dir), "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            # Same tolerance as os.walk's default onerror=None: skip
+            # paths that can't be listed (unreadable, vanished, or not
+            # a directory) instead of failing the whole walk.
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if name[:1] == '.' or name in skip:
+                    continue
+                # Never traverse (or list) symlinks: a user-symlinked
+                # libraries/ entry could point at a huge external tree or
+                # introduce a cycle.
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, prefix + name + sep))
+                elif entry.is_file(follow_symlinks=False):
+                    yield prefix + name
+
+def get_files_in_dir(base_dir: Path) -> Tuple[str, ...]:
+    """
+    Return a sorted tuple of all relative file paths in base_dir.
+    The tuple form is what the caches store: immutable and a bit
+    smaller than the equivalent list. Paths are interned so identical
+    strings repeated across refreshes (and the frequent request-side
+    lookups) share one object.
+    """
+    return tuple(sorted(map(sys.intern, iter_files_in_dir(base_dir))))
+
+class FileContentCache:
+    """
+    Bounded LRU cache of decoded file contents, keyed by
+    (path, mtime_ns, size) so an edited file misses automatically.
+    Files above max_file_bytes bypass the cache entirely to keep
+    memory bounded by max_bytes.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_file_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = asyncio.Lock()
+
+    async def read(self, full_path: Path) -> str:
+        st = os.stat(full_path)
+        if st.st_size > self.max_file_bytes:
+            async with aiofiles.open(full_path, "r", encoding="utf-8", errors="replace") as f:
+                return await f.read()
+
+        key = (str(full_path), st.st_mtime_ns, st.st_size)
+        async with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                return content
+
+        async with aiofiles.open(full_path, "r", encoding="utf-8", errors="replace") as f:
+            content = await f.read()
+
+        async with self._lock:
+            if key not in self._entries:
+                self._entries[key] = content
+                self._bytes += len(content)
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return content
+
+FILE_CONTENT_CACHE = FileContentCache()
+
+
+def make_cache_entry(path: Path, files: Tuple[str, ...]) -> Dict[str, any]:
+    """
+    Build a cache entry for a project or library folder. Files are kept
+    both as a sorted tuple (for listing) and a frozenset (for O(1)
+    membership tests in the read endpoints). The folder's mtime is
+    recorded so the list endpoints can skip re-walking unchanged folders,
+    and the file list is pre-serialized to JSON bytes so the listing
+    endpoints don't re-encode thousands of paths on every hit. Every
+    entry gets a process-unique version for ETag generation.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    files_tuple = tuple(files)
+    return {
+        "path": path,
+        "files": files_tuple,
+        "files_set": frozenset(files_tuple),
+        "mtime_ns": mtime_ns,
+        "files_json": orjson.dumps(files_tuple),
+        "version": next(_CACHE_ENTRY_VERSION)
+    }
 
 # ---------------------------------------------------------
 # Build & Refresh Project Cache
 # ---------------------------------------------------------
-def build_initial_project_cache():
+async def build_initial_project_cache():
     """
     Scan ARDUINO_DIR for projects, build PROJECT_CACHE.
+    Per-project walks run concurrently in threads so independent
+    directory traversals overlap their I/O waits.
     """
     logger.info("Building initial project cache...")
-    PROJECT_CACHE.clear()
 
     # Exclude known system or hidden directories
-    excluded_dirs = {"hardware", "libraries", "tools"}
-
-    for item in ARDUINO_DIR.iterdir():
-        if not item.is_dir():
-            continue
-        if item.name.startswith('.') or item.name.lower() in excluded_dirs:
-            continue
-
-        project_name = item.name
-        PROJECT_CACHE[project_name] = {
-            "path": item,
-            "files": get_files_in_dir(item)
-        }
+    excluded_dirs = _EXCLUDED_DIRS
 
+    candidates = []
+    with os.scandir(ARDUINO_DIR) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.name[:1] == '.' or entry.name.lower() in excluded_dirs:
+                continue
+            candidates.append(entry.name)
+
+    loop = asyncio.get_running_loop()
+    file_lists = await asyncio.gather(
+        *(loop.run_in_executor(FS_EXECUTOR, get_files_in_dir, ARDUINO_DIR / name)
+          for name in candidates)
+    )
+
+    # Populate a fresh dict, then swap it in with one atomic rebind so
+    # concurrent readers never observe a half-built (or cleared) cache.
+    new_cache = {}
+    for project_name, files in zip(candidates, file_lists):
+        new_cache[sys.intern(project_name)] = make_cache_entry(ARDUINO_DIR / project_name, files)
+
+    global PROJECT_CACHE
+    PROJECT_CACHE = new_cache
     logger.info(f"Initial cache built with {len(PROJECT_CACHE)} projects.")
 
 def refresh_project_cache(project_name: str):
@@ -175,48 +350,244 @@ def refresh_project_cache(project_name: str):
     """
     project_name = safe_name(project_name, "project name")
     project_dir = project_dir_for(project_name)
-    if not project_dir.exists():
+    if not is_existing_dir(project_dir):
         logger.info(f"Removing '{project_name}' from PROJECT_CACHE (no longer on disk).")
         PROJECT_CACHE.pop(project_name, None)
         return
 
-    PROJECT_CACHE[project_name] = {
-        "path": project_dir,
-        "files": get_files_in_dir(project_dir)
-    }
-    logger.info(f"Refreshed cache for project '{project_name}'. File count: {len(PROJECT_CACHE[project_name]['files'])}")
+    # Build the entry fully before the (atomic) single-slot assignment so
+    # readers never see a partially-populated entry.
+    entry = make_cache_entry(project_dir, get_files_in_dir(project_dir))
+    PROJECT_CACHE[project_name] = entry
+    logger.info(f"Refreshed cache for project '{project_name}'. File count: {len(entry['files'])}")
 
 # ---------------------------------------------------------
 # Build & Refresh Library Cache
 # ---------------------------------------------------------
-def build_library_cache():
+async def build_library_cache():
     """
     Scan ARDUINO_DIR/libraries for library folders, build LIBRARY_CACHE.
     Libraries are read-only; no create/update endpoints.
+    Per-library walks run concurrently in threads.
     """
     logger.info("Building library cache...")
-    LIBRARY_CACHE.clear()
 
     libraries_dir = ARDUINO_DIR / "libraries"
     if not libraries_dir.exists():
         libraries_dir.mkdir(parents=True, exist_ok=True)
 
-    for lib_folder in libraries_dir.iterdir():
-        if not lib_folder.is_dir() or lib_folder.name.startswith('.'):
-            continue
-        lib_name = lib_folder.name
-        LIBRARY_CACHE[lib_name] = {
-            "path": lib_folder,
-            "files": get_files_in_dir(lib_folder)
-        }
-
+    candidates = []
+    with os.scandir(libraries_dir) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False) or entry.name[:1] == '.':
+                continue
+            candidates.append(entry.name)
+
+    loop = asyncio.get_running_loop()
+    file_lists = await asyncio.gather(
+        *(loop.run_in_executor(FS_EXECUTOR, get_files_in_dir, libraries_dir / name)
+          for name in candidates)
+    )
+
+    # Same copy-on-write swap as the project cache: readers keep whatever
+    # dict they grabbed; writers replace the whole mapping in one step.
+    new_cache = {}
+    for lib_name, files in zip(candidates, file_lists):
+        new_cache[sys.intern(lib_name)] = make_cache_entry(libraries_dir / lib_name, files)
+
+    global LIBRARY_CACHE
+    LIBRARY_CACHE = new_cache
     logger.info(f"Library cache built with {len(LIBRARY_CACHE)} libraries.")
 
+async def refresh_project_cache_async(project_name: str):
+    """
+    Run refresh_project_cache on the fs executor so request handlers
+    don't block the event loop for the duration of the walk.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(FS_EXECUTOR, refresh_project_cache, project_name)
+
+def refresh_library_cache(library_name: str):
+    """
+    Refresh the file list for a single library after an install,
+    uninstall or update, without re-walking every other library.
+    If the folder no longer exists, remove it from LIBRARY_CACHE.
+    """
+    library_name = safe_name(library_name, "library name")
+    libraries_dir = ARDUINO_DIR / "libraries"
+    # arduino-cli installs e.g. "Adafruit GFX Library" into a folder
+    # named Adafruit_GFX_Library, so try both spellings.
+    for folder_name in (library_name, library_name.replace(" ", "_")):
+        lib_dir = libraries_dir / folder_name
+        if lib_dir.is_dir():
+            entry = make_cache_entry(lib_dir, get_files_in_dir(lib_dir))
+            LIBRARY_CACHE[sys.intern(folder_name)] = entry
+            logger.info(f"Refreshed cache for library '{folder_name}'. File count: {len(entry['files'])}")
+            return
+        LIBRARY_CACHE.pop(folder_name, None)
+    logger.info(f"Removed '{library_name}' from LIBRARY_CACHE (no longer on disk).")
+
+async def refresh_library_cache_async(library_name: str):
+    """
+    Run refresh_library_cache on the fs executor so request handlers
+    don't block the event loop for the duration of the walk.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(FS_EXECUTOR, refresh_library_cache, library_name)
+
+# ---------------------------------------------------------
+# Incremental Cache Sync (mtime-based)
+# ---------------------------------------------------------
+async def _sync_folder_cache(parent_dir: Path, cache: Dict[str, Dict[str, any]],
+                             excluded: frozenset = frozenset()) -> Dict[str, Dict[str, any]]:
+    """
+    Reconcile a cache against the folders currently under parent_dir.
+    Only folders whose mtime changed (or that are new) get re-walked;
+    unchanged entries are carried over and disappeared ones dropped.
+    Returns the new cache dict for the caller to swap in.
+    """
+    present = {}
+    with os.scandir(parent_dir) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            name = entry.name
+            if name[:1] == '.' or name.lower() in excluded:
+                continue
+            present[name] = entry.stat(follow_symlinks=False).st_mtime_ns
+
+    stale = [name for name, mtime_ns in present.items()
+             if name not in cache or cache[name]["mtime_ns"] != mtime_ns]
+    loop = asyncio.get_running_loop()
+    file_lists = await asyncio.gather(
+        *(loop.run_in_executor(FS_EXECUTOR, get_files_in_dir, parent_dir / name)
+          for name in stale)
+    )
+    rebuilt = dict(zip(stale, file_lists))
+
+    new_cache = {}
+    for name in present:
+        if name in rebuilt:
+            new_cache[name] = make_cache_entry(parent_dir / name, rebuilt[name])
+        else:
+            new_cache[name] = cache[name]
+    return new_cache
+
+async def sync_project_cache():
+    """
+    Cheap refresh for /list_projects: re-walk only changed project folders.
+    """
+    global PROJECT_CACHE
+    PROJECT_CACHE = await _sync_folder_cache(
+        ARDUINO_DIR, PROJECT_CACHE, excluded=_EXCLUDED_DIRS
+    )
+
+async def sync_library_cache():
+    """
+    Cheap refresh for /list_libraries: re-walk only changed library folders.
+    """
+    libraries_dir = ARDUINO_DIR / "libraries"
+    if not libraries_dir.exists():
+        libraries_dir.mkdir(parents=True, exist_ok=True)
+    global LIBRARY_CACHE
+    LIBRARY_CACHE = await _sync_folder_cache(libraries_dir, LIBRARY_CACHE)
+
+# ---------------------------------------------------------
+# Filesystem Watcher (keeps caches current on manual edits)
+# ---------------------------------------------------------
+class ArduinoDirWatcher(FileSystemEventHandler):
+    """
+    Refreshes the touched project or library whenever files appear,
+    disappear or move under ARDUINO_DIR (IDE saves, manual copies),
+    so per-request rescans aren't the only way to catch external edits.
+    Content-only 'modified' events are ignored: they don't change the
+    cached file listings, and the content cache keys on mtime anyway.
+    """
+    _IGNORED_TOPS = frozenset({"hardware", "tools"})
+
+    def __init__(self):
+        self._pending = set()
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def on_created(self, event):
+        self._handle(event.src_path)
+
+    def on_deleted(self, event):
+        self._handle(event.src_path)
+
+    def on_moved(self, event):
+        self._handle(event.src_path)
+        self._handle(event.dest_path)
+
+    def _handle(self, path: str):
+        try:
+            parts = Path(os.fsdecode(path)).relative_to(ARDUINO_DIR).parts
+        except ValueError:
+            return
+        if not parts or parts[0][:1] == '.':
+            return
+        top = parts[0]
+        if top == "libraries":
+            if len(parts) >= 2 and parts[1][:1] != '.':
+                self._schedule(refresh_library_cache, parts[1])
+        elif top.lower() not in self._IGNORED_TOPS:
+            self._schedule(refresh_project_cache, top)
+
+    def _schedule(self, refresh, name: str):
+        # Coalesce event storms (e.g. an example copy) to one queued
+        # refresh per project/library at a time.
+        key = (refresh.__name__, name)
+        with self._lock:
+            if key in self._pending:
+                # A refresh is queued or running; mark it stale so it
+                # re-walks once more instead of dropping this event.
+                self._dirty.add(key)
+                return
+            self._pending.add(key)
+        FS_EXECUTOR.submit(self._run, refresh, name, key)
+
+    def _run(self, refresh, name: str, key):
+        while True:
+            try:
+                refresh(name)
+            except HTTPException:
+                pass  # names that fail validation are not cacheable anyway
+            except Exception:
+                logger.exception("Watcher refresh failed for %s", name)
+            with self._lock:
+                if key not in self._dirty:
+                    self._pending.discard(key)
+                    return
+                # Events landed mid-walk; go around again.
+                self._dirty.discard(key)
+
+_DIR_OBSERVER = None
+
 # ---------------------------------------------------------
 # Startup: build project & library caches
 # ---------------------------------------------------------
-build_initial_project_cache()
-build_library_cache()
+@app.on_event("startup")
+async def build_caches_on_startup():
+    await build_initial_project_cache()
+    await build_library_cache()
+
+    global _DIR_OBSERVER
+    if Observer is not None:
+        _DIR_OBSERVER = Observer()
+        _DIR_OBSERVER.schedule(ArduinoDirWatcher(), str(ARDUINO_DIR), recursive=True)
+        _DIR_OBSERVER.start()
+        logger.info("Filesystem watcher started on %s", ARDUINO_DIR)
+    else:
+        logger.info("watchdog not installed; relying on per-request cache refreshes.")
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    if _DIR_OBSERVER is not None:
+        _DIR_OBSERVER.stop()
+        _DIR_OBSERVER.join(timeout=5)
+    FS_EXECUTOR.shutdown(wait=False)
+    _LOG_LISTENER.stop()
 
 # ---------------------------------------------------------
 # Pydantic Models
@@ -265,30 +636,89 @@ class CoreSearchRequest(BaseModel):
 # ---------------------------------------------------------
 # Helper Functions
 # ---------------------------------------------------------
-def run_arduino_cli(args: List[str], cwd: Optional[Path] = None) -> Dict[str, str]:
+async def run_arduino_cli(args: List[str], cwd: Optional[Path] = None) -> Dict[str, str]:
+    """
+    Run arduino-cli as an asyncio subprocess; the event loop keeps
+    serving other requests while the command (potentially a multi-second
+    compile or core install) runs.
+    """
     command = ["arduino-cli", *[safe_cli_arg(arg, "arduino-cli argument") for arg in args]]
     try:
-        result = subprocess.run(
-            command,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=True
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=str(cwd) if cwd else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        return {"status": "success", "output": result.stdout, "error": ""}
-    except subprocess.CalledProcessError as e:
-        logger.error("Arduino CLI command failed: %s", command)
-        logger.debug("Arduino CLI stderr: %s", e.stderr)
-        return {"status": "error", "output": "", "error": "arduino-cli command failed"}
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            logger.error("Arduino CLI command failed: %s", command)
+            logger.debug("Arduino CLI stderr: %s", stderr.decode(errors="replace"))
+            return {"status": "error", "output": "", "error": "arduino-cli command failed"}
+        return {"status": "success", "output": stdout.decode(errors="replace"), "error": ""}
     except Exception as e:
         logger.exception("Unexpected error running Arduino CLI command: %s", command)
         return {"status": "error", "output": "", "error": "arduino-cli command failed"}
 
-def create_or_update_file(base_dir: Path, relative_file_path: str, content: str) -> None:
+# TTL cache for read-only arduino-cli invocations: spawning the CLI costs
+# hundreds of ms of process startup, while list/search results only change
+# on install/uninstall or hotplug. Keyed by the full argument tuple.
+_CLI_RESULT_CACHE: Dict[tuple, Tuple[float, Dict[str, str]]] = {}
+
+# In-flight CLI calls by argument tuple: concurrent identical requests
+# (bursty IDE polling) await the first caller's future instead of each
+# forking their own arduino-cli process.
+_CLI_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+async def cached_run_arduino_cli(args: List[str], ttl: float,
+                                 cwd: Optional[Path] = None) -> Dict[str, str]:
+    """
+    Like run_arduino_cli, but serves a recent successful result from the
+    TTL cache instead of forking a new CLI process, and coalesces
+    concurrent identical invocations into a single subprocess. Errors
+    are never cached, so transient failures retry on the next request.
+    """
+    key = tuple(args)
+    now = time.monotonic()
+    hit = _CLI_RESULT_CACHE.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+
+    inflight = _CLI_INFLIGHT.get(key)
+    if inflight is not None:
+        return await inflight
+
+    future = asyncio.get_running_loop().create_future()
+    _CLI_INFLIGHT[key] = future
+    try:
+        result = await run_arduino_cli(args, cwd=cwd)
+        if result["status"] == "success":
+            _CLI_RESULT_CACHE[key] = (now, result)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        # Don't leave coalesced waiters hanging if something escapes
+        # run_arduino_cli (e.g. cancellation).
+        if not future.done():
+            future.set_exception(e)
+        raise
+    finally:
+        _CLI_INFLIGHT.pop(key, None)
+
+def invalidate_cli_cache(*prefixes: str):
+    """
+    Drop cached CLI results whose first argument matches one of the
+    given prefixes (e.g. "lib", "core", "board"). Called by the write
+    endpoints after a successful install/uninstall/update.
+    """
+    for key in [k for k in _CLI_RESULT_CACHE if k and k[0] in prefixes]:
+        _CLI_RESULT_CACHE.pop(key, None)
+
+async def create_or_update_file(base_dir: Path, relative_file_path: str, content: str) -> None:
     full_path = resolve_under(base_dir, safe_relative_path(relative_file_path, "file path"), "file path")
     full_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(full_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    async with aiofiles.open(full_path, "w", encoding="utf-8") as f:
+        await f.write(content)
     logger.info("File created/updated: %s", full_path)
 
 # ---------------------------------------------------------
@@ -300,8 +730,7 @@ async def check_folder(request: ProjectRequest):
     Check if the specified project folder exists.
     """
     project_dir = project_dir_for(request.project_name)
-    exists = project_dir.exists() and project_dir.is_dir()
-    return {"exists": exists}
+    return {"exists": is_existing_dir(project_dir)}
 
 @app.post("/read_files", deprecated=True)
 async def read_files(request: ProjectRequest):
@@ -311,35 +740,46 @@ async def read_files(request: ProjectRequest):
     Use /read_file to get actual file content on demand.
     """
     project_name = safe_name(request.project_name, "project name")
-    if project_name not in PROJECT_CACHE:
+    cache = PROJECT_CACHE
+    if project_name not in cache:
         project_dir = project_dir_for(project_name)
-        if not project_dir.exists():
+        if not is_existing_dir(project_dir):
             raise HTTPException(status_code=404, detail="Project folder not found")
-        refresh_project_cache(project_name)
+        await refresh_project_cache_async(project_name)
+        cache = PROJECT_CACHE
 
-    files_list = PROJECT_CACHE[project_name]["files"]
+    files_list = cache[project_name]["files"]
     return {
         "files": files_list,
         "message": "Use /read_file to get content of individual files."
     }
 
 @app.get("/list_files_in_project")
-async def list_files_in_project(project_name: str):
+async def list_files_in_project(project_name: str, request: Request):
     """
     Return the list of all file paths (no content) for a given project.
     Uses PROJECT_CACHE. If missing, attempt to refresh. If still missing, 404.
+    The response body is assembled from the entry's pre-serialized file
+    list, and polling clients sending If-None-Match get a bodyless 304
+    while the entry is unchanged.
     """
     project_name = safe_name(project_name, "project name")
-    if project_name not in PROJECT_CACHE:
+    cache = PROJECT_CACHE
+    if project_name not in cache:
         project_dir = project_dir_for(project_name)
-        if not project_dir.exists():
+        if not is_existing_dir(project_dir):
             raise HTTPException(status_code=404, detail="Project folder not found")
-        refresh_project_cache(project_name)
+        await refresh_project_cache_async(project_name)
+        cache = PROJECT_CACHE
 
-    return {
-        "project_name": project_name,
-        "files": PROJECT_CACHE[project_name]["files"]
-    }
+    entry = cache[project_name]
+    etag = f'W/"{project_name}-{entry["version"]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    body = (b'{"project_name":' + orjson.dumps(project_name)
+            + b',"files":' + entry["files_json"] + b'}')
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @app.post("/read_file")
 async def read_file(request: ReadFileRequest):
@@ -349,32 +789,65 @@ async def read_file(request: ReadFileRequest):
     project_name = safe_name(request.project_name, "project name")
     file_path = str(safe_relative_path(request.file_path, "file path"))
 
-    if project_name not in PROJECT_CACHE:
-        refresh_project_cache(project_name)
-        if project_name not in PROJECT_CACHE:
+    cache = PROJECT_CACHE
+    if project_name not in cache:
+        await refresh_project_cache_async(project_name)
+        cache = PROJECT_CACHE
+        if project_name not in cache:
             raise HTTPException(status_code=404, detail="Project folder not found")
 
-    if file_path not in PROJECT_CACHE[project_name]["files"]:
-        # Check if file actually exists on disk
-        full_path = project_file_for(project_name, file_path)
-        if not full_path.exists():
+    entry = cache[project_name]
+    if file_path not in entry["files_set"]:
+        # Only pay for a re-walk if the project folder actually changed
+        # since the entry was built; otherwise a typo'd path would
+        # trigger a full directory walk per bad request.
+        try:
+            dir_mtime_ns = os.stat(entry["path"]).st_mtime_ns
+        except OSError:
+            raise HTTPException(status_code=404, detail="Project folder not found")
+        if dir_mtime_ns == entry["mtime_ns"]:
             raise HTTPException(status_code=404, detail="File not found in project")
-        # Refresh the cache
-        refresh_project_cache(project_name)
+        # Folder changed on disk: refresh the cache and recheck
+        await refresh_project_cache_async(project_name)
+        cache = PROJECT_CACHE
 
-        if file_path not in PROJECT_CACHE[project_name]["files"]:
+        if file_path not in cache[project_name]["files_set"]:
             raise HTTPException(status_code=404, detail="File not found in project after refresh")
 
     # Read content
     full_path = project_file_for(project_name, file_path)
     try:
-        with open(full_path, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
+        content = await FILE_CONTENT_CACHE.read(full_path)
         return {"file_path": file_path, "content": content}
     except Exception as e:
         logger.exception("Failed to read file %s", full_path)
         raise HTTPException(status_code=500, detail="Failed to read file")
 
+async def iter_file(path: Path, chunk_size: int = 65536):
+    """
+    Yield a file's bytes in fixed-size chunks for StreamingResponse,
+    so large files never get fully materialized in memory.
+    """
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+@app.post("/download_file")
+async def download_file(request: ReadFileRequest):
+    """
+    Streams the raw bytes of a single project file. Unlike /read_file,
+    the content is not JSON-wrapped, so memory stays constant no matter
+    how large the file is.
+    """
+    project_name = safe_name(request.project_name, "project name")
+    file_path = str(safe_relative_path(request.file_path, "file path"))
+
+    full_path = project_file_for(project_name, file_path)
+    if not full_path.is_file():
+        raise HTTPException(status_code=404, detail="File not found in project")
+
+    return StreamingResponse(iter_file(full_path), media_type="text/plain; charset=utf-8")
+
 @app.post("/create_project")
 async def create_project(request: SketchRequest):
     project_name = safe_name(request.project_name, "project name")
@@ -385,8 +858,8 @@ async def create_project(request: SketchRequest):
     try:
         project_dir.mkdir(parents=True, exist_ok=True)
         file_path = str(safe_relative_path(request.file_path, "file path")) if request.file_path else f"{project_name}.ino"
-        create_or_update_file(project_dir, file_path, request.sketch_content)
-        refresh_project_cache(project_name)
+        await create_or_update_file(project_dir, file_path, request.sketch_content)
+        await refresh_project_cache_async(project_name)
 
         return {
             "status": "success",
@@ -400,33 +873,43 @@ async def create_project(request: SketchRequest):
 async def update_sketch(request: SketchRequest):
     project_name = safe_name(request.project_name, "project name")
     project_dir = project_dir_for(project_name)
-    if not project_dir.exists():
+    if not is_existing_dir(project_dir):
         raise HTTPException(status_code=404, detail="Project or sketch file not found")
 
     file_path = str(safe_relative_path(request.file_path, "file path")) if request.file_path else f"{project_name}.ino"
     try:
-        create_or_update_file(project_dir, file_path, request.sketch_content)
-        refresh_project_cache(project_name)
+        await create_or_update_file(project_dir, file_path, request.sketch_content)
+        await refresh_project_cache_async(project_name)
         return {"status": "success", "message": f"Updated file '{file_path}' in project '{project_name}'"}
     except Exception as e:
         logger.exception("Failed to update file in %s", project_dir)
         raise HTTPException(status_code=500, detail="Failed to update file")
 
+def project_entry_with_sketch(project_name: str) -> Dict[str, any]:
+    """
+    Look up a project in PROJECT_CACHE and verify its <name>.ino exists,
+    answering from the cached file set instead of two stat calls.
+    Raises 404 if the project or sketch is missing.
+    """
+    entry = PROJECT_CACHE.get(project_name)
+    if entry is None or f"{project_name}.ino" not in entry["files_set"]:
+        raise HTTPException(status_code=404, detail="Project or sketch file not found")
+    return entry
+
 @app.post("/compile_project")
 async def compile_project(request: ProjectRequest):
     project_name = safe_name(request.project_name, "project name")
-    project_dir = project_dir_for(project_name)
-    ino_file = project_dir / f"{project_name}.ino"
-
-    if not project_dir.exists() or not ino_file.exists():
-        raise HTTPException(status_code=404, detail="Project or sketch file not found")
+    if project_name not in PROJECT_CACHE:
+        await refresh_project_cache_async(project_name)
+    entry = project_entry_with_sketch(project_name)
+    project_dir = entry["path"]
 
     args = [
         "compile",
         "--fqbn", "arduino:avr:nano:cpu=atmega328old",
         str(project_dir)
     ]
-    result = run_arduino_cli(args, cwd=ARDUINO_DIR)
+    result = await run_arduino_cli(args, cwd=ARDUINO_DIR)
     if result["status"] == "error":
         return {"status": "error", "message": result["error"]}
     return result
@@ -434,11 +917,10 @@ async def compile_project(request: ProjectRequest):
 @app.post("/upload_project")
 async def upload_project(request: UploadRequest):
     project_name = safe_name(request.project_name, "project name")
-    project_dir = project_dir_for(project_name)
-    ino_file = project_dir / f"{project_name}.ino"
-
-    if not project_dir.exists() or not ino_file.exists():
-        raise HTTPException(status_code=404, detail="Project or sketch file not found")
+    if project_name not in PROJECT_CACHE:
+        await refresh_project_cache_async(project_name)
+    entry = project_entry_with_sketch(project_name)
+    project_dir = entry["path"]
 
     args = [
         "upload",
@@ -446,7 +928,7 @@ async def upload_project(request: UploadRequest):
         "--fqbn", "arduino:avr:nano:cpu=atmega328old",
         str(project_dir)
     ]
-    result = run_arduino_cli(args, cwd=ARDUINO_DIR)
+    result = await run_arduino_cli(args, cwd=ARDUINO_DIR)
     if result["status"] == "error":
         return {"status": "error", "message": result["error"]}
     return result
@@ -455,8 +937,9 @@ async def upload_project(request: UploadRequest):
 async def list_projects():
     """
     Refresh and list all project folders in ARDUINO_DIR (excluding system).
+    Only project folders whose mtime changed are re-walked.
     """
-    build_initial_project_cache()
+    await sync_project_cache()
     project_list = sorted(PROJECT_CACHE.keys())
     return {
         "projects": project_list,
@@ -470,23 +953,32 @@ async def list_projects():
 async def list_libraries():
     """
     Lists the names of all libraries in Arduino/libraries, read from LIBRARY_CACHE.
+    Only library folders whose mtime changed are re-walked.
     """
-    build_library_cache()
+    await sync_library_cache()
     libs = sorted(LIBRARY_CACHE.keys())
     return {"libraries": libs}
 
 @app.get("/list_files_in_library")
-async def list_files_in_library(library_name: str):
+async def list_files_in_library(library_name: str, request: Request):
     """
     Return the file paths in a specified library (read-only). No content returned here.
+    Served from the entry's pre-serialized file list, with ETag/304
+    handling for polling clients.
     """
     library_name = safe_name(library_name, "library name")
-    if library_name not in LIBRARY_CACHE:
+    cache = LIBRARY_CACHE
+    if library_name not in cache:
         raise HTTPException(status_code=404, detail="Library not found")
-    return {
-        "library_name": library_name,
-        "files": LIBRARY_CACHE[library_name]["files"]
-    }
+
+    entry = cache[library_name]
+    etag = f'W/"{library_name}-{entry["version"]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    body = (b'{"library_name":' + orjson.dumps(library_name)
+            + b',"files":' + entry["files_json"] + b'}')
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @app.post("/read_library_file")
 async def read_library_file(request: ReadLibraryFileRequest):
@@ -497,21 +989,40 @@ async def read_library_file(request: ReadLibraryFileRequest):
     library_name = safe_name(request.library_name, "library name")
     file_path = str(safe_relative_path(request.file_path, "file path"))
 
-    if library_name not in LIBRARY_CACHE:
+    cache = LIBRARY_CACHE
+    if library_name not in cache:
         raise HTTPException(status_code=404, detail="Library not found in cache")
 
-    if file_path not in LIBRARY_CACHE[library_name]["files"]:
+    if file_path not in cache[library_name]["files_set"]:
         raise HTTPException(status_code=404, detail="File not found in this library")
 
     full_path = library_file_for(library_name, file_path)
     try:
-        with open(full_path, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
+        content = await FILE_CONTENT_CACHE.read(full_path)
         return {"file_path": file_path, "content": content}
     except Exception as e:
         logger.exception("Failed to read library file %s", full_path)
         raise HTTPException(status_code=500, detail="Failed to read library file")
 
+@app.post("/download_library_file")
+async def download_library_file(request: ReadLibraryFileRequest):
+    """
+    Streams the raw bytes of a single library file, read-only.
+    Companion to /download_file for the library tree: no JSON wrapper,
+    constant memory for arbitrarily large sources.
+    """
+    library_name = safe_name(request.library_name, "library name")
+    file_path = str(safe_relative_path(request.file_path, "file path"))
+
+    cache = LIBRARY_CACHE
+    if library_name not in cache:
+        raise HTTPException(status_code=404, detail="Library not found in cache")
+    if file_path not in cache[library_name]["files_set"]:
+        raise HTTPException(status_code=404, detail="File not found in this library")
+
+    full_path = library_file_for(library_name, file_path)
+    return StreamingResponse(iter_file(full_path), media_type="text/plain; charset=utf-8")
+
 # ---------------------------------------------------------
 # Copy Example Folder from Library to New Project
 # ---------------------------------------------------------
@@ -525,10 +1036,11 @@ async def copy_library_example(request: CopyExampleRequest):
     example_folder = str(safe_relative_path(request.example_folder, "example folder"))
     new_project_name = safe_name(request.new_project_name, "project name")
 
-    if library_name not in LIBRARY_CACHE:
+    cache = LIBRARY_CACHE
+    if library_name not in cache:
         raise HTTPException(status_code=404, detail="Library not found")
 
-    library_path = LIBRARY_CACHE[library_name]["path"]
+    library_path = cache[library_name]["path"]
     source_folder = resolve_under(library_path / "examples", safe_relative_path(example_folder, "example folder"), "example folder")
     if not source_folder.exists() or not source_folder.is_dir():
         raise HTTPException(status_code=404, detail="Example folder not found in library")
@@ -536,22 +1048,36 @@ async def copy_library_example(request: CopyExampleRequest):
     project_dir = project_dir_for(new_project_name)
     project_dir.mkdir(parents=True, exist_ok=True)
 
-    # Recursively copy
+    # Recursively copy. Directories are created up front, then the file
+    # copies run concurrently in threads; shutil.copyfile takes the
+    # in-kernel fast path (sendfile and friends) and skips the metadata
+    # copy, which a fresh project folder doesn't need.
+    copies = []
+    source_len = len(str(source_folder)) + 1
+    skip = _SKIP_NAMES
+    join = os.path.join
     for root, dirs, files in os.walk(source_folder):
-        # skip hidden dirs
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        rel = Path(root).relative_to(source_folder)
+        # skip hidden dirs (slice check avoids a startswith call per name)
+        dirs[:] = [d for d in dirs if d[:1] != '.']
+        # os.walk yields root as a string; slice off the source prefix
+        # instead of allocating Path objects just to relativize it.
+        rel = root[source_len:]
         dest_dir = project_dir / rel
         dest_dir.mkdir(parents=True, exist_ok=True)
 
         for file in files:
-            if file.startswith('.') or file in ['.DS_Store', 'Thumbs.db']:
+            if file[:1] == '.' or file in skip:
                 continue
-            src_file = Path(root) / file
-            shutil.copy2(src_file, dest_dir)
+            copies.append((join(root, file), dest_dir / file))
+
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(loop.run_in_executor(FS_EXECUTOR, shutil.copyfile, src, dest)
+          for src, dest in copies)
+    )
 
     # Refresh project cache so new files appear
-    refresh_project_cache(new_project_name)
+    await refresh_project_cache_async(new_project_name)
 
     return {
         "status": "success",
@@ -566,52 +1092,90 @@ async def list_libraries_installed():
     """
     Run `arduino-cli lib list` to see all installed libraries (CLI text-based).
     """
-    result = run_arduino_cli(["lib", "list"])
+    result = await cached_run_arduino_cli(["lib", "list"], ttl=30)
     return result
 
 @app.post("/search_library")
 async def search_library(request: LibrarySearchRequest):
-    return run_arduino_cli(["lib", "search", safe_cli_arg(request.keyword, "search keyword")])
+    return await cached_run_arduino_cli(["lib", "search", safe_cli_arg(request.keyword, "search keyword")], ttl=300)
 
 @app.post("/install_library")
 async def install_library(request: LibraryRequest):
-    r = run_arduino_cli(["lib", "install", safe_cli_arg(request.library_name, "library name")])
-    build_library_cache()  # refresh to reflect new library folder
+    r = await run_arduino_cli(["lib", "install", safe_cli_arg(request.library_name, "library name")])
+    await refresh_library_cache_async(request.library_name)  # refresh to reflect new library folder
+    invalidate_cli_cache("lib")
     return r
 
 @app.post("/uninstall_library")
 async def uninstall_library(request: LibraryRequest):
-    r = run_arduino_cli(["lib", "uninstall", safe_cli_arg(request.library_name, "library name")])
-    build_library_cache()
+    r = await run_arduino_cli(["lib", "uninstall", safe_cli_arg(request.library_name, "library name")])
+    await refresh_library_cache_async(request.library_name)
+    invalidate_cli_cache("lib")
     return r
 
 @app.post("/update_library")
 async def update_library(request: LibraryRequest):
-    r = run_arduino_cli(["lib", "update", safe_cli_arg(request.library_name, "library name")])
-    build_library_cache()
+    r = await run_arduino_cli(["lib", "update", safe_cli_arg(request.library_name, "library name")])
+    await refresh_library_cache_async(request.library_name)
+    invalidate_cli_cache("lib")
     return r
 
 @app.post("/update_all_libraries")
 async def update_all_libraries():
-    r = run_arduino_cli(["lib", "update"])
-    build_library_cache()
+    r = await run_arduino_cli(["lib", "update"])
+    await build_library_cache()
+    invalidate_cli_cache("lib")
     return r
 
+def _parse_cli_json(result: Dict[str, str]):
+    """
+    Turn a run_arduino_cli result into parsed JSON, or an error marker
+    if the command failed or emitted something unparsable.
+    """
+    if result["status"] != "success":
+        return {"status": "error", "error": result["error"]}
+    try:
+        return {"status": "success", "data": orjson.loads(result["output"])}
+    except orjson.JSONDecodeError:
+        return {"status": "error", "error": "failed to parse arduino-cli output"}
+
+@app.get("/status")
+async def status():
+    """
+    One-shot overview: installed libraries, connected boards and
+    installed cores, fetched with `--format json` in parallel so a
+    client refresh pays one CLI round-trip instead of three.
+    """
+    lib_result, board_result, core_result = await asyncio.gather(
+        cached_run_arduino_cli(["lib", "list", "--format", "json"], ttl=30),
+        cached_run_arduino_cli(["board", "list", "--format", "json"], ttl=30),
+        cached_run_arduino_cli(["core", "list", "--format", "json"], ttl=30),
+    )
+    return {
+        "libraries": _parse_cli_json(lib_result),
+        "boards": _parse_cli_json(board_result),
+        "cores": _parse_cli_json(core_result),
+    }
+
 # ---------------------------------------------------------
 # Board / Core Management Endpoints
 # ---------------------------------------------------------
 @app.get("/list_connected_boards")
 async def list_connected_boards():
-    return run_arduino_cli(["board", "list"])
+    return await cached_run_arduino_cli(["board", "list"], ttl=30)
 
 @app.post("/search_cores")
 async def search_cores(request: CoreSearchRequest):
-    return run_arduino_cli(["core", "search", safe_cli_arg(request.keyword, "search keyword")])
+    return await cached_run_arduino_cli(["core", "search", safe_cli_arg(request.keyword, "search keyword")], ttl=300)
 
 @app.post("/install_core")
 async def install_core(request: CoreRequest):
-    return run_arduino_cli(["core", "install", safe_cli_arg(request.core, "core")])
+    r = await run_arduino_cli(["core", "install", safe_cli_arg(request.core, "core")])
+    invalidate_cli_cache("core", "board")
+    return r
 
 @app.post("/uninstall_core")
 async def uninstall_core(request: CoreRequest):
-    return run_arduino_cli(["core", "uninstall", safe_cli_arg(request.core, "core")])
+    r = await run_arduino_cli(["core", "uninstall", safe_cli_arg(request.core, "core")])
+    invalidate_cli_cache("core", "board")
+    return r